@@ -0,0 +1,105 @@
+import json
+from datetime import datetime
+
+from flask import request, jsonify, Blueprint
+
+from app.jobs.handlers import remove_upload, save_upload
+from app.jobs.job_manager import job_manager, FINISHED_STATUSES, RUNNING
+from app.models.jobs import Job
+
+jobs_bp = Blueprint('jobs', __name__, url_prefix='/api/jobs')
+
+# 任务文件只能上传，不接受客户端传入的服务器路径
+FILE_PARAMS = ('path', 'upload')
+
+
+def job_to_dict(job):
+    """将任务对象转换为字典格式，执行中的任务按当前速度估算剩余时间"""
+    eta_seconds = None
+    if job.status == RUNNING and job.started_at and job.progress_total and job.progress_current:
+        elapsed = (datetime.utcnow() - job.started_at).total_seconds()
+        eta_seconds = round(elapsed / job.progress_current * (job.progress_total - job.progress_current), 1)
+
+    return {
+        'id': job.id,
+        'job_type': job.job_type,
+        'status': job.status,
+        'params': json.loads(job.params) if job.params else None,
+        'result': json.loads(job.result) if job.result else None,
+        'error': job.error,
+        'progress_current': job.progress_current,
+        'progress_total': job.progress_total,
+        'eta_seconds': eta_seconds,
+        'cancel_requested': job.cancel_requested,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None
+    }
+
+
+@jobs_bp.route('', methods=['POST'])
+def create_job():
+    """创建后台任务：JSON {type, params}，或 multipart 表单（type + file + 其他参数）"""
+    if request.form or request.files:
+        job_type = request.form.get('type')
+        params = {key: value for key, value in request.form.items() if key != 'type'}
+        upload = request.files.get('file')
+    else:
+        data = request.get_json(silent=True) or {}
+        job_type = data.get('type')
+        params = data.get('params') or {}
+        upload = None
+
+    if not isinstance(params, dict):
+        return jsonify({'error': 'params must be an object'}), 400
+    rejected = [key for key in FILE_PARAMS if key in params]
+    if rejected:
+        return jsonify({'error': f"File paths are not accepted ({', '.join(rejected)}), upload the file instead"}), 400
+    if job_type not in job_manager.handlers:
+        return jsonify({'error': f"Unknown job type: {job_type}"}), 400
+
+    if upload:
+        params['upload'] = save_upload(upload)
+    try:
+        job = job_manager.submit(job_type, params)
+    except ValueError as e:
+        remove_upload(params)
+        return jsonify({'error': str(e)}), 400
+    return jsonify(job_to_dict(job)), 202
+
+
+@jobs_bp.route('', methods=['GET'])
+def get_jobs():
+    """获取任务列表"""
+    status = request.args.get('status')
+    job_type = request.args.get('type')
+    limit = min(request.args.get('limit', 50, type=int), 200)
+
+    query = Job.query
+    if status:
+        query = query.filter(Job.status == status)
+    if job_type:
+        query = query.filter(Job.job_type == job_type)
+
+    jobs = query.order_by(Job.created_at.desc()).limit(limit).all()
+    return jsonify({'jobs': [job_to_dict(job) for job in jobs]})
+
+
+@jobs_bp.route('/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """获取任务状态、进度和预计剩余时间"""
+    job = Job.query.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job_to_dict(job))
+
+
+@jobs_bp.route('/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """取消任务"""
+    job = Job.query.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    if job.status in FINISHED_STATUSES:
+        return jsonify({'error': f"Job already {job.status}"}), 409
+    return jsonify(job_to_dict(job_manager.cancel(job)))
@@ -0,0 +1,55 @@
+import math
+
+from flask import request, jsonify, Blueprint, current_app
+
+# 只读快照服务模式：与 components_bp 相同的GET接口，数据来自内存映射的目录快照
+snapshot_bp = Blueprint('components_snapshot', __name__, url_prefix='/api/components')
+
+# 快照中没有归一化规格列，不支持规格范围查询
+UNSUPPORTED_FILTERS = ('value_min', 'value_max', 'capacity_min', 'capacity_max')
+
+
+def get_snapshot():
+    return current_app.extensions['catalog_snapshot']
+
+
+@snapshot_bp.route('/components', methods=['GET'])
+def get_all_components():
+    """获取所有元器件列表（快照）"""
+    category = request.args.get('category')
+    subcategory = request.args.get('subcategory')
+    part_number = request.args.get('part_number')
+    # 与数据库模式 paginate(error_out=False) 一致：page 小于1按第1页，per_page 小于1按20条
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = request.args.get('per_page', 20, type=int)
+    if per_page < 1:
+        per_page = 20
+
+    if any(name in request.args for name in UNSUPPORTED_FILTERS):
+        return jsonify({'error': 'Spec range filters are not supported in snapshot mode'}), 400
+
+    snapshot = get_snapshot()
+    if part_number:
+        component = snapshot.get_by_part_number(part_number)
+        matched = [component] if component and \
+            (not category or component['component_category'] == category) and \
+            (not subcategory or component['component_subcategory'] == subcategory) else []
+        components, total = matched[(page - 1) * per_page:page * per_page], len(matched)
+    else:
+        components, total = snapshot.list(category, subcategory, page, per_page)
+
+    return jsonify({
+        'components': components,
+        'total': total,
+        'pages': math.ceil(total / per_page),
+        'current_page': page
+    })
+
+
+@snapshot_bp.route('/<int:component_id>', methods=['GET'])
+def get_component(component_id):
+    """获取特定元器件详情（快照）"""
+    component = get_snapshot().get(component_id)
+    if not component:
+        return jsonify({'error': 'Component not found'}), 404
+    return jsonify(component)
@@ -14,14 +14,24 @@ CREATE TABLE electronic_components (
     operating_temperature_max FLOAT COMMENT '最高工作温度，单位：°C',
     component_category VARCHAR(20) NOT NULL COMMENT '元器件大类',
     component_subcategory VARCHAR(20) NOT NULL COMMENT '元器件子类',
-    created_at DATETIME DEFAULT CURRENT_TIMESTAMP COMMENT '记录创建时间',
-    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '记录最后更新时间',
+    created_at DATETIME(6) DEFAULT CURRENT_TIMESTAMP(6) COMMENT '记录创建时间',
+    updated_at DATETIME(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6) COMMENT '记录最后更新时间',
     INDEX idx_category (component_category),
     INDEX idx_subcategory (component_subcategory),
     INDEX idx_manufacturer (manufacturer),
-    INDEX idx_part_number (part_number)
+    INDEX idx_part_number (part_number),
+    INDEX idx_updated_at_id (updated_at, id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='电子元器件基础表';
 
+-- 元器件删除记录表
+CREATE TABLE component_tombstones (
+    id INT AUTO_INCREMENT PRIMARY KEY COMMENT '删除记录ID',
+    component_id INT NOT NULL COMMENT '被删除的元器件ID',
+    part_number VARCHAR(50) NOT NULL COMMENT '被删除的元器件型号/料号',
+    component_category VARCHAR(20) COMMENT '被删除的元器件大类',
+    deleted_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '删除时间'
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='元器件删除记录表';
+
 -- 电源管理芯片表
 CREATE TABLE power_management_chips (
     id INT PRIMARY KEY COMMENT '外键关联基础元器件ID',
@@ -91,10 +101,12 @@ CREATE TABLE memory_chips (
     memory_type VARCHAR(50) COMMENT '存储器类型',
     capacity INT COMMENT '存储容量',
     capacity_unit VARCHAR(10) COMMENT '容量单位',
+    capacity_bits BIGINT COMMENT '归一化存储容量，单位：bit',
     interface_type VARCHAR(50) COMMENT '接口类型',
     speed FLOAT COMMENT '读写速度，单位：MHz或MB/s',
     operating_voltage FLOAT COMMENT '工作电压，单位：V',
-    FOREIGN KEY (id) REFERENCES electronic_components(id) ON DELETE CASCADE
+    FOREIGN KEY (id) REFERENCES electronic_components(id) ON DELETE CASCADE,
+    INDEX ix_memory_chips_capacity_bits (capacity_bits)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='存储器芯片表';
 
 -- 分立器件表
@@ -118,7 +130,10 @@ CREATE TABLE passive_components (
     tolerance FLOAT COMMENT '容差，单位：%',
     rated_voltage FLOAT COMMENT '额定电压，单位：V',
     temperature_coefficient VARCHAR(50) COMMENT '温度系数',
-    FOREIGN KEY (id) REFERENCES electronic_components(id) ON DELETE CASCADE
+    nominal_value_base DOUBLE COMMENT '换算到基本单位的额定值',
+    value_base_unit VARCHAR(4) COMMENT '基本单位：Ω、F、H',
+    FOREIGN KEY (id) REFERENCES electronic_components(id) ON DELETE CASCADE,
+    INDEX idx_value_base (value_base_unit, nominal_value_base)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='被动元件表';
 
 -- 滤波器表
@@ -142,4 +157,21 @@ CREATE TABLE relays (
     contact_voltage_rating FLOAT COMMENT '触点额定电压，单位：V',
     operate_time FLOAT COMMENT '操作时间，单位：ms',
     FOREIGN KEY (id) REFERENCES electronic_components(id) ON DELETE CASCADE
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='继电器表';
\ No newline at end of file
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='继电器表';
+-- 后台任务表
+CREATE TABLE jobs (
+    id VARCHAR(36) PRIMARY KEY COMMENT '任务唯一标识ID',
+    job_type VARCHAR(50) NOT NULL COMMENT '任务类型',
+    status VARCHAR(20) NOT NULL DEFAULT 'queued' COMMENT '任务状态',
+    params LONGTEXT COMMENT '任务参数，JSON格式',
+    result LONGTEXT COMMENT '任务结果，JSON格式',
+    error TEXT COMMENT '失败时的错误信息',
+    progress_current INT DEFAULT 0 COMMENT '已处理数量',
+    progress_total INT COMMENT '待处理总数量，未知时为空',
+    cancel_requested BOOLEAN DEFAULT FALSE COMMENT '是否已请求取消',
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP COMMENT '任务创建时间',
+    started_at DATETIME COMMENT '任务开始执行时间',
+    finished_at DATETIME COMMENT '任务结束时间',
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '记录最后更新时间',
+    INDEX idx_status_type_created (status, job_type, created_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='后台任务表';
@@ -0,0 +1,7 @@
+-- 已有数据库升级：变更订阅所需的微秒精度时间戳和 (updated_at, id) 索引
+USE electronic_components_db;
+
+ALTER TABLE electronic_components
+    MODIFY created_at DATETIME(6) DEFAULT CURRENT_TIMESTAMP(6) COMMENT '记录创建时间',
+    MODIFY updated_at DATETIME(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6) COMMENT '记录最后更新时间',
+    ADD INDEX idx_updated_at_id (updated_at, id);
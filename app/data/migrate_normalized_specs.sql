@@ -0,0 +1,11 @@
+-- 已有数据库升级：规格归一化列（应用启动时自动回填存量数据）
+USE electronic_components_db;
+
+ALTER TABLE memory_chips
+    ADD COLUMN capacity_bits BIGINT COMMENT '归一化存储容量，单位：bit',
+    ADD INDEX ix_memory_chips_capacity_bits (capacity_bits);
+
+ALTER TABLE passive_components
+    ADD COLUMN nominal_value_base DOUBLE COMMENT '换算到基本单位的额定值',
+    ADD COLUMN value_base_unit VARCHAR(4) COMMENT '基本单位：Ω、F、H',
+    ADD INDEX idx_value_base (value_base_unit, nominal_value_base);
@@ -0,0 +1,338 @@
+# app/database/catalog_snapshot.py
+"""
+元器件目录只读快照（二进制、内存映射）
+
+文件布局（小端序，各数据段按8字节对齐）：
+    头部    magic(8s) version(H) reserved(H) meta_offset(Q) meta_length(Q)
+    字符串表 排序后去重的字符串：结束偏移数组(uint32, count+1) + UTF-8数据
+    子类型段 每个子类型一组定长列，字符串列存字符串表下标
+    ID索引   按id排序的 (id, 子类型序号, 行号)
+    型号索引 按part_number排序的 (字符串下标, 子类型序号, 行号)
+    元数据   JSON：各段偏移、子类型列定义
+"""
+import bisect
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+MAGIC = b'CHIPSNAP'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sHHQQ')
+
+# 列类型：代码 -> (array类型码, 空值)
+INT_NULL = -(1 << 63)
+STRING_NULL = 0xFFFFFFFF
+BOOL_NULL = -1
+COLUMN_TYPES = {
+    'i': 'q',  # 整数
+    'f': 'd',  # 浮点数，空值为NaN
+    'b': 'b',  # 布尔
+    's': 'I',  # 字符串（字符串表下标）
+    't': 'q',  # 时间，距1970-01-01的微秒数
+}
+
+EPOCH = datetime(1970, 1, 1)
+
+# 分类过滤结果缓存的最大条目数
+FILTER_CACHE_SIZE = 64
+
+
+class SnapshotError(Exception):
+    """快照文件格式错误"""
+
+
+def column_type_code(column):
+    """根据SQLAlchemy列类型确定快照列类型"""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return 's'
+    if python_type is bool:
+        return 'b'
+    if python_type is int:
+        return 'i'
+    if python_type is float:
+        return 'f'
+    if python_type is datetime:
+        return 't'
+    return 's'
+
+
+def _encode_value(type_code, value, string_index):
+    if type_code == 's':
+        return STRING_NULL if value is None else string_index[str(value)]
+    if type_code == 'f':
+        return math.nan if value is None else float(value)
+    if type_code == 'b':
+        return BOOL_NULL if value is None else int(bool(value))
+    if type_code == 't':
+        if value is None:
+            return INT_NULL
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        delta = value - EPOCH
+        return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+    return INT_NULL if value is None else int(value)
+
+
+def _to_bytes(values):
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class _SectionWriter:
+    def __init__(self, f):
+        self.f = f
+
+    def write(self, data):
+        """写入一个数据段（8字节对齐），返回段起始偏移"""
+        padding = -self.f.tell() % 8
+        self.f.write(b'\0' * padding)
+        offset = self.f.tell()
+        self.f.write(data)
+        return offset
+
+
+def write_snapshot(path, components, to_dict):
+    """导出快照：components 为元器件ORM对象迭代器，to_dict 为与API一致的序列化函数，返回导出数量"""
+    groups = {}
+    strings = set()
+    for component in components:
+        data = to_dict(component)
+        cls = type(component)
+        group = groups.get(cls.__name__)
+        if group is None:
+            mapper_columns = cls.__mapper__.columns
+            group = groups[cls.__name__] = {
+                'columns': [(name, column_type_code(mapper_columns[name]) if name in mapper_columns else 's')
+                            for name in data],
+                'rows': []
+            }
+        group['rows'].append(data)
+        for name, type_code in group['columns']:
+            if type_code == 's' and data.get(name) is not None:
+                strings.add(str(data[name]))
+
+    # 字符串表排序，字符串下标的顺序即字典序，便于二分查找
+    sorted_strings = sorted(strings)
+    string_index = {value: index for index, value in enumerate(sorted_strings)}
+    encoded = [value.encode('utf-8') for value in sorted_strings]
+    string_ends = array('I', [0])
+    for value in encoded:
+        string_ends.append(string_ends[-1] + len(value))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(b'\0' * HEADER.size)
+        writer = _SectionWriter(f)
+        meta = {
+            'exported_at': datetime.utcnow().isoformat(),
+            'strings': {
+                'count': len(sorted_strings),
+                'ends': writer.write(_to_bytes(string_ends)),
+                'data': writer.write(b''.join(encoded))
+            },
+            'groups': []
+        }
+
+        id_entries = []
+        part_entries = []
+        for group_number, (name, group) in enumerate(groups.items()):
+            rows = group['rows']
+            columns = []
+            for column_name, type_code in group['columns']:
+                values = array(COLUMN_TYPES[type_code],
+                               (_encode_value(type_code, row.get(column_name), string_index) for row in rows))
+                columns.append({'name': column_name, 'type': type_code, 'offset': writer.write(_to_bytes(values))})
+            meta['groups'].append({'name': name, 'count': len(rows), 'columns': columns})
+
+            for row_number, row in enumerate(rows):
+                id_entries.append((row['id'], group_number, row_number))
+                part_entries.append((string_index[row['part_number']], group_number, row_number))
+
+        id_entries.sort()
+        part_entries.sort()
+        meta['id_index'] = {
+            'count': len(id_entries),
+            'ids': writer.write(_to_bytes(array('q', (entry[0] for entry in id_entries)))),
+            'groups': writer.write(_to_bytes(array('I', (entry[1] for entry in id_entries)))),
+            'rows': writer.write(_to_bytes(array('I', (entry[2] for entry in id_entries))))
+        }
+        meta['part_index'] = {
+            'count': len(part_entries),
+            'strings': writer.write(_to_bytes(array('I', (entry[0] for entry in part_entries)))),
+            'groups': writer.write(_to_bytes(array('I', (entry[1] for entry in part_entries)))),
+            'rows': writer.write(_to_bytes(array('I', (entry[2] for entry in part_entries))))
+        }
+
+        meta_bytes = json.dumps(meta).encode('utf-8')
+        meta_offset = writer.write(meta_bytes)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, meta_offset, len(meta_bytes)))
+
+    os.replace(tmp_path, path)
+    return len(id_entries)
+
+
+class CatalogSnapshot:
+    """内存映射的只读快照 - 打开时只解析元数据，查询时按需读取单行字段"""
+
+    def __init__(self, path):
+        if sys.byteorder != 'little':
+            raise SnapshotError('Catalog snapshots can only be served on little-endian hosts')
+
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mm)
+
+        magic, version, _, meta_offset, meta_length = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise SnapshotError(f"Not a catalog snapshot: {path}")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(f"Unsupported snapshot version {version}, expected {FORMAT_VERSION}")
+        meta = json.loads(self._mm[meta_offset:meta_offset + meta_length])
+        self.exported_at = meta['exported_at']
+
+        strings = meta['strings']
+        self._string_count = strings['count']
+        self._string_ends = self._array(strings['ends'], 'I', self._string_count + 1)
+        self._string_data = strings['data']
+
+        self._groups = []
+        for group in meta['groups']:
+            self._groups.append([
+                (column['name'], column['type'],
+                 self._array(column['offset'], COLUMN_TYPES[column['type']], group['count']))
+                for column in group['columns']
+            ])
+
+        id_index = meta['id_index']
+        self.count = id_index['count']
+        self._ids = self._array(id_index['ids'], 'q', self.count)
+        self._id_groups = self._array(id_index['groups'], 'I', self.count)
+        self._id_rows = self._array(id_index['rows'], 'I', self.count)
+
+        part_index = meta['part_index']
+        self._part_strings = self._array(part_index['strings'], 'I', part_index['count'])
+        self._part_groups = self._array(part_index['groups'], 'I', part_index['count'])
+        self._part_rows = self._array(part_index['rows'], 'I', part_index['count'])
+
+        # 按 (大类, 子类) 缓存过滤后的ID索引位置（LRU）
+        self._filter_cache = OrderedDict()
+        self._filter_lock = threading.Lock()
+
+    def _array(self, offset, typecode, count):
+        size = array(typecode).itemsize
+        return self._view[offset:offset + size * count].cast(typecode)
+
+    def _string(self, index):
+        start = self._string_ends[index]
+        end = self._string_ends[index + 1]
+        offset = self._string_data
+        return bytes(self._view[offset + start:offset + end]).decode('utf-8')
+
+    def _find_string(self, value):
+        """在排序后的字符串表中二分查找，返回下标，不存在时返回None"""
+        low, high = 0, self._string_count
+        while low < high:
+            mid = (low + high) // 2
+            if self._string(mid) < value:
+                low = mid + 1
+            else:
+                high = mid
+        if low < self._string_count and self._string(low) == value:
+            return low
+        return None
+
+    def _row(self, group_number, row_number):
+        data = {}
+        for name, type_code, values in self._groups[group_number]:
+            value = values[row_number]
+            if type_code == 's':
+                value = None if value == STRING_NULL else self._string(value)
+            elif type_code == 'f':
+                value = None if math.isnan(value) else value
+            elif type_code == 'b':
+                value = None if value == BOOL_NULL else bool(value)
+            elif type_code == 't':
+                value = None if value == INT_NULL else (EPOCH + timedelta(microseconds=value)).isoformat()
+            elif value == INT_NULL:
+                value = None
+            data[name] = value
+        return data
+
+    def _column(self, group_number, name):
+        for column_name, _, values in self._groups[group_number]:
+            if column_name == name:
+                return values
+        return None
+
+    def get(self, component_id):
+        """按ID查询元器件"""
+        position = bisect.bisect_left(self._ids, component_id)
+        if position < self.count and self._ids[position] == component_id:
+            return self._row(self._id_groups[position], self._id_rows[position])
+        return None
+
+    def get_by_part_number(self, part_number):
+        """按型号查询元器件"""
+        string_number = self._find_string(part_number)
+        if string_number is None:
+            return None
+        position = bisect.bisect_left(self._part_strings, string_number)
+        if position < len(self._part_strings) and self._part_strings[position] == string_number:
+            return self._row(self._part_groups[position], self._part_rows[position])
+        return None
+
+    def _filtered_positions(self, category, subcategory):
+        wanted = [(name, self._find_string(value)) for name, value in
+                  (('component_category', category), ('component_subcategory', subcategory)) if value]
+        # 快照中不存在的取值直接返回空结果，不写入缓存
+        if any(string_number is None for _, string_number in wanted):
+            return array('I')
+
+        key = (category, subcategory)
+        with self._filter_lock:
+            positions = self._filter_cache.get(key)
+            if positions is not None:
+                self._filter_cache.move_to_end(key)
+                return positions
+
+        positions = array('I')
+        group_columns = [[self._column(group_number, name) for name, _ in wanted]
+                         for group_number in range(len(self._groups))]
+        for position in range(self.count):
+            row_number = self._id_rows[position]
+            columns = group_columns[self._id_groups[position]]
+            if all(column is not None and column[row_number] == string_number
+                   for column, (_, string_number) in zip(columns, wanted)):
+                positions.append(position)
+
+        with self._filter_lock:
+            self._filter_cache[key] = positions
+            if len(self._filter_cache) > FILTER_CACHE_SIZE:
+                self._filter_cache.popitem(last=False)
+        return positions
+
+    def list(self, category=None, subcategory=None, page=1, per_page=20):
+        """按ID顺序分页列出元器件，返回 (当前页元器件, 总数)"""
+        start = max(page - 1, 0) * per_page
+        if category or subcategory:
+            positions = self._filtered_positions(category, subcategory)
+            total = len(positions)
+            page_positions = positions[start:start + per_page]
+        else:
+            total = self.count
+            page_positions = range(start, min(start + per_page, total))
+        items = [self._row(self._id_groups[position], self._id_rows[position]) for position in page_positions]
+        return items, total
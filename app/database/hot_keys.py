@@ -0,0 +1,141 @@
+# app/database/hot_keys.py
+import json
+import logging
+import os
+import random
+import threading
+import time
+from typing import List, Optional
+
+from app.database.redis_client import cache
+
+
+class HotKeyTracker:
+    """热点键统计 - 采样 + Count-Min Sketch 的近似LFU，用于部署后的缓存预热"""
+
+    def __init__(self, name: str, width: int = 2048, depth: int = 4, sample_rate: float = 0.1,
+                 top_k: int = 1000, decay_every: int = 10000, flush_interval: int = 60,
+                 redis_decay_interval: int = 3600, backup_file: Optional[str] = None):
+        self.name = name
+        self.width = width
+        self.depth = depth
+        self.sample_rate = sample_rate
+        self.top_k = top_k
+        self.decay_every = decay_every
+        self.flush_interval = flush_interval
+        self.redis_decay_interval = redis_decay_interval
+        self.backup_file = backup_file
+        self.redis_key = f"hot_keys:{name}"
+        self.logger = logging.getLogger(__name__)
+
+        self._sketch = [[0] * width for _ in range(depth)]
+        # 候选热点键及其估计频次
+        self._candidates = {}
+        # 上次持久化以来的采样次数，持久化时累加到Redis中所有进程共享的热点集合
+        self._pending = {}
+        self._samples = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _positions(self, key: int):
+        # 整数的 hash 不受 PYTHONHASHSEED 影响，多进程间结果一致
+        return [hash((row, key)) % self.width for row in range(self.depth)]
+
+    def record(self, key: int) -> None:
+        """记录一次访问（按采样率采样）"""
+        if random.random() >= self.sample_rate:
+            return
+
+        with self._lock:
+            estimate = None
+            for row, pos in enumerate(self._positions(key)):
+                self._sketch[row][pos] += 1
+                count = self._sketch[row][pos]
+                estimate = count if estimate is None else min(estimate, count)
+            self._candidates[key] = estimate
+            self._pending[key] = self._pending.get(key, 0) + 1
+
+            if len(self._candidates) > self.top_k * 2:
+                self._prune()
+            if len(self._pending) > self.top_k * 2:
+                self._pending = dict(sorted(self._pending.items(), key=lambda item: item[1],
+                                            reverse=True)[:self.top_k])
+
+            self._samples += 1
+            if self._samples % self.decay_every == 0:
+                self._decay()
+
+            should_flush = time.monotonic() - self._last_flush >= self.flush_interval
+            if should_flush:
+                self._last_flush = time.monotonic()
+                pending, self._pending = self._pending, {}
+
+        if should_flush:
+            self.persist(pending)
+
+    def _prune(self) -> None:
+        self._candidates = dict(self._top())
+
+    def _decay(self) -> None:
+        # 计数减半，让历史热点逐渐冷却（LFU老化）
+        for row in self._sketch:
+            for i in range(self.width):
+                row[i] >>= 1
+        self._candidates = {k: v >> 1 for k, v in self._candidates.items() if v > 1}
+
+    def _top(self):
+        return sorted(self._candidates.items(), key=lambda item: item[1], reverse=True)[:self.top_k]
+
+    def hot_keys(self) -> List[int]:
+        """当前进程统计的热点键，按热度降序"""
+        with self._lock:
+            return [key for key, _ in self._top()]
+
+    def persist(self, pending=None) -> None:
+        """将采样计数合并到Redis热点集合（多个worker累加，按间隔整体衰减），并可选写入本地备份文件"""
+        if pending is None:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        # 按采样率换算为估计访问次数后累加，保留两倍top_k的成员，避免排名边缘的键被过早淘汰
+        increments = {key: count / self.sample_rate for key, count in pending.items()}
+        cache.merge_sorted_set(self.redis_key, increments, max_size=self.top_k * 2, expire=7 * 24 * 3600)
+        # 分值减半，让历史热点逐渐冷却；多个worker中每个间隔只有一个执行
+        cache.decay_sorted_set(self.redis_key, 0.5, self.redis_decay_interval)
+
+        if self.backup_file:
+            # 备份合并后的热点集合，Redis不可用时退回当前进程的统计
+            keys = [int(key) for key in cache.get_sorted_set(self.redis_key, self.top_k)] or self.hot_keys()
+            try:
+                tmp_path = f"{self.backup_file}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump(keys, f)
+                os.replace(tmp_path, self.backup_file)
+            except OSError as e:
+                self.logger.error(f"Hot keys backup error: {e}")
+
+    def load(self, limit: Optional[int] = None) -> List[int]:
+        """读取持久化的热点集合，Redis中没有时回退到本地备份文件"""
+        limit = limit or self.top_k
+        keys = cache.get_sorted_set(self.redis_key, limit)
+        if keys:
+            return [int(key) for key in keys]
+
+        if self.backup_file and os.path.exists(self.backup_file):
+            try:
+                with open(self.backup_file) as f:
+                    return [int(key) for key in json.load(f)][:limit]
+            except (OSError, TypeError, ValueError) as e:
+                self.logger.error(f"Hot keys backup load error: {e}")
+        return []
+
+
+# 元器件详情访问热度统计实例
+component_hot_keys = HotKeyTracker(
+    'component',
+    sample_rate=float(os.environ.get('HOT_KEYS_SAMPLE_RATE', '0.1')),
+    top_k=int(os.environ.get('HOT_KEYS_TOP_K', '1000')),
+    backup_file=os.environ.get('HOT_KEYS_BACKUP_FILE')
+)
@@ -2,7 +2,7 @@
 import redis
 import json
 import logging
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
 
 
 class RedisCache:
@@ -34,6 +34,52 @@ class RedisCache:
             self.logger.error(f"Cache set error: {e}")
             return False
 
+    def set_many(self, items: Dict[str, Any], expire: int = 300) -> bool:
+        """通过pipeline批量设置缓存数据"""
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.setex(key, expire, json.dumps(value))
+            pipe.execute()
+            return True
+        except Exception as e:
+            self.logger.error(f"Cache set_many error: {e}")
+            return False
+
+    def merge_sorted_set(self, key: str, increments: Dict[Any, float], max_size: int, expire: int = 0) -> bool:
+        """累加有序集合成员的分值（多个进程的统计合并），只保留分值最高的max_size个成员"""
+        try:
+            pipe = self.redis_client.pipeline()
+            for member, amount in increments.items():
+                pipe.zincrby(key, amount, member)
+            pipe.zremrangebyrank(key, 0, -max_size - 1)
+            if expire:
+                pipe.expire(key, expire)
+            pipe.execute()
+            return True
+        except Exception as e:
+            self.logger.error(f"Cache merge_sorted_set error: {e}")
+            return False
+
+    def decay_sorted_set(self, key: str, factor: float, interval: int) -> bool:
+        """有序集合所有成员的分值乘以factor，interval秒内多个进程只执行一次，返回是否执行"""
+        try:
+            if not self.redis_client.set(f"{key}:decayed", 1, nx=True, ex=interval):
+                return False
+            self.redis_client.zunionstore(key, {key: factor})
+            return True
+        except Exception as e:
+            self.logger.error(f"Cache decay_sorted_set error: {e}")
+            return False
+
+    def get_sorted_set(self, key: str, limit: int) -> List[str]:
+        """按分值降序获取有序集合的前limit个成员"""
+        try:
+            return self.redis_client.zrevrange(key, 0, limit - 1)
+        except Exception as e:
+            self.logger.error(f"Cache get_sorted_set error: {e}")
+            return []
+
     def delete(self, key: str) -> bool:
         """删除缓存数据"""
         try:
@@ -0,0 +1,99 @@
+# app/database/replica_router.py
+import itertools
+import logging
+import threading
+import time
+from functools import wraps
+from typing import List, Optional
+
+from flask import g, request
+from sqlalchemy.exc import OperationalError
+
+from app.database.database import db
+
+
+class ReplicaRouter:
+    """只读副本路由 - 轮询选择健康副本，故障副本冷却后再重试"""
+
+    # 写请求后在该时间窗口内的读请求走主库，保证读到自己的写入
+    PRIMARY_COOKIE = 'read_primary_until'
+    CONSISTENCY_HEADER = 'X-Read-Consistency'
+
+    def __init__(self, failure_cooldown: int = 30, consistency_window: int = 5):
+        self.failure_cooldown = failure_cooldown
+        self.consistency_window = consistency_window
+        self.bind_keys: List[str] = []
+        self.logger = logging.getLogger(__name__)
+
+        self._counter = itertools.count()
+        self._down_until = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app, replica_urls: List[str]) -> None:
+        """将副本注册为 SQLALCHEMY_BINDS，需在 db.init_app 之前调用"""
+        binds = app.config.setdefault('SQLALCHEMY_BINDS', {})
+        self.bind_keys = []
+        for index, url in enumerate(replica_urls):
+            bind_key = f'replica_{index}'
+            binds[bind_key] = url
+            self.bind_keys.append(bind_key)
+        app.after_request(self._remember_write)
+
+    def choose(self, exclude=()) -> Optional[str]:
+        """轮询选择一个健康副本，没有可用副本时返回None（使用主库）"""
+        now = time.monotonic()
+        with self._lock:
+            start = next(self._counter)
+            for offset in range(len(self.bind_keys)):
+                bind_key = self.bind_keys[(start + offset) % len(self.bind_keys)]
+                if bind_key not in exclude and self._down_until.get(bind_key, 0) <= now:
+                    return bind_key
+        return None
+
+    def mark_down(self, bind_key: str) -> None:
+        """标记副本故障，冷却期内不再路由"""
+        with self._lock:
+            self._down_until[bind_key] = time.monotonic() + self.failure_cooldown
+        self.logger.warning(f"Read replica {bind_key} marked down for {self.failure_cooldown}s")
+
+    def requires_primary(self) -> bool:
+        """当前请求是否必须读主库"""
+        if not self.bind_keys or request.method not in ('GET', 'HEAD'):
+            return True
+        if request.headers.get(self.CONSISTENCY_HEADER, '').lower() == 'strong':
+            return True
+        read_primary_until = request.cookies.get(self.PRIMARY_COOKIE, type=float)
+        return read_primary_until is not None and read_primary_until > time.time()
+
+    def _remember_write(self, response):
+        if request.method in ('POST', 'PUT', 'PATCH', 'DELETE') and response.status_code < 400 and self.bind_keys:
+            response.set_cookie(self.PRIMARY_COOKIE, str(time.time() + self.consistency_window),
+                                max_age=self.consistency_window, httponly=True)
+        return response
+
+
+# 全局副本路由实例
+replica_router = ReplicaRouter()
+
+
+def read_replica(view):
+    """GET接口装饰器：路由到只读副本，副本连接失败时切换到下一个副本，最终回退主库"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if replica_router.requires_primary():
+            return view(*args, **kwargs)
+
+        tried = set()
+        while True:
+            bind_key = replica_router.choose(exclude=tried)
+            g.read_bind_key = bind_key
+            try:
+                return view(*args, **kwargs)
+            except OperationalError:
+                db.session.rollback()
+                if bind_key is None:
+                    raise
+                replica_router.mark_down(bind_key)
+                tried.add(bind_key)
+
+    return wrapper
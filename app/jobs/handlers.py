@@ -0,0 +1,313 @@
+# app/jobs/handlers.py
+import csv
+import io
+import os
+import tempfile
+import uuid
+from contextlib import closing
+
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.controllers.component_controller import cache_components, export_catalog_snapshot
+from app.database.database import db
+from app.database.hot_keys import component_hot_keys
+from app.jobs.job_manager import job_manager
+from app.models.discrete_devices import DiscreteDevice
+from app.models.electronic_components import ElectronicComponent
+from app.models.filters import Filter
+from app.models.mcu_controllers import MCUController
+from app.models.memory_chips import MemoryChip
+from app.models.passive_components import PassiveComponent
+from app.models.power_management_chips import ACDCController, DCDCConverter, LDORegulator
+from app.models.relays import Relay
+
+# 任务文件目录：导入、BOM匹配只读取上传到 JOB_UPLOAD_DIR 的文件，快照只导出到 JOB_EXPORT_DIR
+JOB_UPLOAD_DIR = os.environ.get('JOB_UPLOAD_DIR', os.path.join(tempfile.gettempdir(), 'chip_jobs', 'uploads'))
+JOB_EXPORT_DIR = os.environ.get('JOB_EXPORT_DIR', os.path.join(tempfile.gettempdir(), 'chip_jobs', 'exports'))
+
+IMPORT_BATCH_SIZE = 500
+BOM_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 100
+
+# 导入时按 component_category（电源芯片按 power_chip_type）确定元器件类型
+IMPORT_CLASSES = {
+    'ac_dc': ACDCController,
+    'dc_dc': DCDCConverter,
+    'ldo': LDORegulator,
+    'mcu': MCUController,
+    'memory': MemoryChip,
+    'discrete': DiscreteDevice,
+    'passive': PassiveComponent,
+    'filter': Filter,
+    'relay': Relay,
+}
+REQUIRED_FIELDS = ('name', 'manufacturer', 'part_number', 'component_category', 'component_subcategory')
+# 由数据库或写入事件维护的列，导入时忽略
+IGNORED_FIELDS = ('id', 'created_at', 'updated_at', 'capacity_bits', 'nominal_value_base', 'value_base_unit')
+TRUE_VALUES = ('1', 'true', 'yes', 'y')
+
+
+def job_file_path(directory, name):
+    """返回任务目录下的文件路径，文件名解析到目录之外时抛出ValueError"""
+    base = os.path.realpath(directory)
+    path = os.path.realpath(os.path.join(base, str(name)))
+    if os.path.dirname(path) != base:
+        raise ValueError(f"Invalid job file: {name}")
+    return path
+
+
+def save_upload(upload):
+    """保存上传的任务文件，返回生成的文件名"""
+    os.makedirs(JOB_UPLOAD_DIR, exist_ok=True)
+    name = f"{uuid.uuid4()}.csv"
+    upload.save(job_file_path(JOB_UPLOAD_DIR, name))
+    return name
+
+
+@job_manager.on_finish
+def remove_upload(params):
+    """任务结束（含排队中取消）后删除上传的文件"""
+    if params.get('upload'):
+        try:
+            os.remove(job_file_path(JOB_UPLOAD_DIR, params['upload']))
+        except (OSError, ValueError):
+            pass
+
+
+def _upload_path(params):
+    if not params.get('upload'):
+        raise ValueError('An uploaded CSV file is required')
+    return job_file_path(JOB_UPLOAD_DIR, params['upload'])
+
+
+def _check_params(params, allowed):
+    unknown = sorted(set(params) - set(allowed))
+    if unknown:
+        raise ValueError(f"Unknown params: {', '.join(unknown)}")
+
+
+def _positive_int(params, name):
+    """可选的正整数参数，multipart 表单中的参数为字符串，统一转换为int"""
+    value = params.get(name)
+    if value is None or value == '':
+        return None
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer")
+    if value < 1:
+        raise ValueError(f"{name} must be a positive integer")
+    return value
+
+
+def validate_import_params(params):
+    """导入任务参数：必须上传CSV文件"""
+    _check_params(params, ('upload',))
+    if not params.get('upload'):
+        raise ValueError('import requires an uploaded CSV file')
+    return {'upload': params['upload']}
+
+
+def validate_export_params(params):
+    """快照导出任务没有参数"""
+    _check_params(params, ())
+    return {}
+
+
+def validate_cache_rebuild_params(params):
+    """缓存重建任务参数：scope 为 hot 或 all，limit 为正整数"""
+    _check_params(params, ('scope', 'limit'))
+    scope = params.get('scope') or 'hot'
+    if scope not in ('hot', 'all'):
+        raise ValueError("scope must be 'hot' or 'all'")
+    validated = {'scope': scope}
+    limit = _positive_int(params, 'limit')
+    if limit is not None:
+        validated['limit'] = limit
+    return validated
+
+
+def validate_bom_params(params):
+    """BOM匹配任务参数：items 为含 part_number 的对象列表，或上传CSV文件，二者选一"""
+    _check_params(params, ('items', 'upload'))
+    items = params.get('items')
+    if items is None:
+        if not params.get('upload'):
+            raise ValueError('bom_match requires items or an uploaded CSV file')
+        return {'upload': params['upload']}
+    if params.get('upload'):
+        raise ValueError('bom_match accepts either items or an uploaded CSV file, not both')
+    if not isinstance(items, list) or not all(
+            isinstance(item, dict) and isinstance(item.get('part_number'), str) and item['part_number'].strip()
+            for item in items):
+        raise ValueError('items must be a list of objects with a non-empty part_number')
+    return {'items': [{'part_number': item['part_number'].strip(), 'quantity': item.get('quantity')}
+                      for item in items]}
+
+
+def _convert(column, value):
+    value = value.strip()
+    if value == '':
+        return None
+    python_type = column.type.python_type
+    if python_type is bool:
+        return value.lower() in TRUE_VALUES
+    if python_type in (int, float):
+        return python_type(value)
+    # MySQL严格模式下超长字符串会使插入失败，解析时按列长度校验
+    length = getattr(column.type, 'length', None)
+    if length and len(value) > length:
+        raise ValueError(f"{column.name} exceeds {length} characters")
+    return value
+
+
+def read_csv_chunks(f, first_line):
+    """按记录边界将CSV切分为原始字节块（引号内的换行不切分），返回 (字节块, 首行行号) 迭代器"""
+    lines = []
+    quotes = 0
+    for line in f:
+        lines.append(line)
+        # 转义的引号成对出现，累计引号数为偶数时当前行是一条记录的结尾
+        quotes += line.count(b'"')
+        if quotes % 2 == 0 and len(lines) >= IMPORT_BATCH_SIZE:
+            yield b''.join(lines), first_line
+            first_line += len(lines)
+            lines = []
+    if lines:
+        yield b''.join(lines), first_line
+
+
+def parse_component_rows(chunk):
+    """解析一批CSV记录并按模型列类型转换（CPU密集型，在进程池中执行），返回 (有效行, 错误, 字节数)"""
+    header, content, first_line = chunk
+    rows = []
+    errors = []
+    reader = csv.reader(io.StringIO(content.decode('utf-8'), newline=''))
+    next_line = first_line
+    for record in reader:
+        line_number, next_line = next_line, first_line + reader.line_num
+        if not record:
+            continue
+        row = dict(zip(header, record))
+        category = row.get('component_category', '').strip()
+        cls = IMPORT_CLASSES.get(row.get('power_chip_type', '').strip() if category == 'power' else category)
+        if cls is None:
+            errors.append({'line': line_number, 'error': f"Unknown component category: {category}"})
+            continue
+        missing = [field for field in REQUIRED_FIELDS if not row.get(field, '').strip()]
+        if missing:
+            errors.append({'line': line_number, 'error': f"Missing fields: {', '.join(missing)}"})
+            continue
+        try:
+            columns = cls.__mapper__.columns
+            data = {name: _convert(columns[name], value) for name, value in row.items()
+                    if name in columns and name not in IGNORED_FIELDS}
+        except ValueError as e:
+            errors.append({'line': line_number, 'error': str(e)})
+            continue
+        rows.append((line_number, cls.__name__, data))
+    return rows, errors, len(content)
+
+
+@job_manager.register('import', concurrency=1, validate=validate_import_params)
+def import_components(ctx, params):
+    """从上传的CSV文件批量导入元器件，表头为元器件字段名；进度按已处理的字节数上报"""
+    path = _upload_path(params)
+    classes = {cls.__name__: cls for cls in IMPORT_CLASSES.values()}
+    created = 0
+    errors = []
+    seen = set()
+
+    # 任务线程只读取文件并按记录边界切块，分词和类型转换在进程池中执行
+    with open(path, 'rb') as f:
+        header_line = f.readline()
+        header = [name.strip() for name in next(csv.reader([header_line.decode('utf-8-sig')]), [])]
+        processed = len(header_line)
+        total = os.path.getsize(path)
+        ctx.progress(processed, total, force=True)
+
+        # 首行为表头，数据从第2行开始
+        chunks = ((header, content, first_line) for content, first_line in read_csv_chunks(f, 2))
+        with closing(ctx.map_cpu(parse_component_rows, chunks)) as results:
+            for rows, chunk_errors, size in results:
+                errors.extend(chunk_errors)
+                part_numbers = [data['part_number'] for _, _, data in rows]
+                # 型号唯一索引按MySQL排序规则不区分大小写，重复检查统一按casefold比较
+                existing = {part_number.casefold() for part_number, in
+                            db.session.query(ElectronicComponent.part_number)
+                            .filter(ElectronicComponent.part_number.in_(part_numbers))}
+                for line_number, class_name, data in rows:
+                    key = data['part_number'].casefold()
+                    if key in existing or key in seen:
+                        errors.append({'line': line_number,
+                                       'error': f"Duplicate part_number: {data['part_number']}"})
+                        continue
+                    # 每行在独立的保存点中写入，单行违反约束只记录错误，不影响其他行和整个任务
+                    try:
+                        with db.session.begin_nested():
+                            db.session.add(classes[class_name](**data))
+                    except (IntegrityError, DataError) as e:
+                        errors.append({'line': line_number, 'error': str(e.orig)})
+                        continue
+                    seen.add(key)
+                    created += 1
+                db.session.commit()
+
+                processed += size
+                ctx.progress(processed, total)
+
+    return {'created': created, 'error_count': len(errors), 'errors': errors[:MAX_REPORTED_ERRORS]}
+
+
+@job_manager.register('export_snapshot', concurrency=1, validate=validate_export_params)
+def export_snapshot(ctx, params):
+    """导出只读目录快照到 JOB_EXPORT_DIR，文件名由任务ID生成"""
+    os.makedirs(JOB_EXPORT_DIR, exist_ok=True)
+    path = job_file_path(JOB_EXPORT_DIR, f"catalog-{ctx.job_id}.snap")
+    return {'path': path, 'exported': export_catalog_snapshot(path, progress=ctx.progress)}
+
+
+@job_manager.register('cache_rebuild', concurrency=1, validate=validate_cache_rebuild_params)
+def rebuild_cache(ctx, params):
+    """重建元器件详情缓存，scope 为 hot（热点集合）或 all（全部元器件）"""
+    if params.get('scope', 'hot') == 'all':
+        component_ids = [component_id for component_id, in
+                         db.session.query(ElectronicComponent.id).order_by(ElectronicComponent.id)]
+    else:
+        component_ids = component_hot_keys.load(params.get('limit'))
+    return {'cached': cache_components(component_ids, progress=ctx.progress)}
+
+
+@job_manager.register('bom_match', concurrency=2, validate=validate_bom_params)
+def match_bom(ctx, params):
+    """BOM匹配：按型号匹配元器件，items 为 [{part_number, quantity}]，或上传含 part_number 列的CSV"""
+    items = params.get('items')
+    if items is None:
+        with open(_upload_path(params), newline='', encoding='utf-8-sig') as f:
+            items = [{'part_number': row.get('part_number', ''), 'quantity': row.get('quantity')}
+                     for row in csv.DictReader(f)]
+
+    matched = []
+    unmatched = []
+    for start in range(0, len(items), BOM_BATCH_SIZE):
+        batch = items[start:start + BOM_BATCH_SIZE]
+        part_numbers = [item['part_number'].strip() for item in batch]
+        # 直接比较型号以使用唯一索引，MySQL排序规则不区分大小写，返回的型号大小写可能与BOM中不同，
+        # 按大写在内存中对应（SQLite按区分大小写匹配）
+        components = {component.part_number.upper(): component for component in
+                      ElectronicComponent.query.filter(ElectronicComponent.part_number.in_(part_numbers))}
+        for item, part_number in zip(batch, part_numbers):
+            component = components.get(part_number.upper())
+            if component is None:
+                unmatched.append({'part_number': part_number, 'quantity': item.get('quantity')})
+            else:
+                matched.append({
+                    'part_number': part_number,
+                    'quantity': item.get('quantity'),
+                    'component_id': component.id,
+                    'name': component.name,
+                    'manufacturer': component.manufacturer
+                })
+        ctx.progress(start + len(batch), len(items))
+
+    return {'matched': matched, 'unmatched': unmatched}
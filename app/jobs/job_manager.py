@@ -0,0 +1,328 @@
+# app/jobs/job_manager.py
+import atexit
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+
+from app.database.database import db
+from app.models.jobs import Job
+
+# 任务状态
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """任务已被取消"""
+
+
+class _ClaimRejected(Exception):
+    """认领后执行中的同类型任务数超过并发上限"""
+
+
+class JobContext:
+    """任务执行上下文 - 供任务处理函数上报进度、检查取消、提交CPU密集型步骤"""
+
+    def __init__(self, manager, job_id, params):
+        self.manager = manager
+        self.job_id = job_id
+        self.params = params
+        self.current = 0
+        self.total = None
+        self._last_report = 0.0
+
+    def progress(self, current, total=None, force=False):
+        """上报进度（按时间间隔节流写库），同时检查取消请求"""
+        self.current = current
+        if total is not None:
+            self.total = total
+        now = time.monotonic()
+        if not force and now - self._last_report < self.manager.progress_interval:
+            return
+        self._last_report = now
+
+        # 使用独立连接写入，不影响任务处理函数自身的会话事务
+        table = Job.__table__
+        with db.engine.begin() as conn:
+            conn.execute(table.update().where(table.c.id == self.job_id).values(
+                progress_current=self.current, progress_total=self.total, updated_at=datetime.utcnow()))
+            cancel_requested = conn.execute(
+                select(table.c.cancel_requested).where(table.c.id == self.job_id)).scalar()
+        if cancel_requested:
+            raise JobCancelled()
+
+    def check_cancelled(self):
+        """立即检查取消请求"""
+        self.progress(self.current, force=True)
+
+    def map_cpu(self, fn, items, max_pending=None):
+        """在进程池中执行CPU密集型步骤，按输入顺序返回结果迭代器；
+        items 按需逐批提交（同时最多 max_pending 批在途），迭代器关闭后取消尚未开始的批次"""
+        pool = self.manager.process_pool()
+        max_pending = max_pending or 2 * self.manager.max_processes
+        pending = deque()
+        try:
+            for item in items:
+                pending.append(pool.submit(fn, item))
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+class JobManager:
+    """后台任务管理 - 任务状态持久化在数据库，本地线程池执行，每种任务类型的并发上限对所有进程生效"""
+
+    def __init__(self, poll_interval=1.0, progress_interval=0.5, heartbeat_interval=30, stale_after=600,
+                 finish_retries=5):
+        self.poll_interval = poll_interval
+        self.progress_interval = progress_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self.finish_retries = finish_retries
+        self.handlers = {}
+        self.concurrency = {}
+        self.validators = {}
+        self.finish_hooks = []
+        self.logger = logging.getLogger(__name__)
+
+        self.app = None
+        self._threads = None
+        self._processes = None
+        self.max_processes = 1
+        self._active = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+
+    def register(self, job_type, concurrency=1, validate=None):
+        """注册任务处理函数：handler(ctx, params) -> 结果（可JSON序列化）；
+        validate(params) 在提交时校验并转换参数，参数无效时抛出ValueError"""
+        def decorator(handler):
+            self.handlers[job_type] = handler
+            self.concurrency[job_type] = concurrency
+            if validate is not None:
+                self.validators[job_type] = validate
+            return handler
+        return decorator
+
+    def on_finish(self, hook):
+        """注册任务结束回调：hook(params)，用于清理任务文件等"""
+        self.finish_hooks.append(hook)
+        return hook
+
+    def init_app(self, app, max_processes=None):
+        """启动调度线程，需在建表之后调用；只应在提供服务或执行任务的进程中调用"""
+        self.app = app
+        self.max_processes = max_processes or os.cpu_count() or 1
+        # 线程数等于各类型并发上限之和，已认领的任务不会在线程池中排队
+        self._threads = ThreadPoolExecutor(max_workers=max(sum(self.concurrency.values()), 1),
+                                           thread_name_prefix='job')
+        threading.Thread(target=self._dispatch_loop, name='job-dispatcher', daemon=True).start()
+        atexit.register(self.shutdown)
+
+    def wait(self):
+        """阻塞直到调度停止（独立任务进程使用）"""
+        while not self._stopped.wait(1):
+            pass
+
+    def shutdown(self):
+        self._stopped.set()
+        self._wakeup.set()
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+
+    def process_pool(self):
+        """CPU密集型步骤使用的进程池（spawn方式启动，避免fork带入线程和数据库连接）"""
+        with self._lock:
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(max_workers=self.max_processes,
+                                                      mp_context=multiprocessing.get_context('spawn'))
+            return self._processes
+
+    def submit(self, job_type, params=None):
+        """校验参数、创建任务并唤醒调度线程，任务类型未知或参数无效时抛出ValueError"""
+        if job_type not in self.handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+        if job_type in self.validators:
+            params = self.validators[job_type](params or {})
+        job = Job(id=str(uuid.uuid4()), job_type=job_type, status=QUEUED, params=json.dumps(params or {}))
+        db.session.add(job)
+        db.session.commit()
+        self._wakeup.set()
+        return job
+
+    def cancel(self, job):
+        """取消任务：排队中的任务直接取消，执行中的任务在下次上报进度时停止"""
+        # 条件更新，避免与调度线程认领任务竞争；提交后job重新加载最新状态
+        table = Job.__table__
+        now = datetime.utcnow()
+        cancelled = db.session.execute(table.update().where(table.c.id == job.id, table.c.status == QUEUED)
+                                       .values(status=CANCELLED, finished_at=now, updated_at=now)).rowcount
+        if not cancelled:
+            db.session.execute(table.update().where(table.c.id == job.id, table.c.status == RUNNING)
+                               .values(cancel_requested=True))
+        db.session.commit()
+        if cancelled:
+            self._call_finish_hooks(json.loads(job.params or '{}'))
+        return job
+
+    def _dispatch_loop(self):
+        last_heartbeat = 0.0
+        while not self._stopped.is_set():
+            try:
+                with self.app.app_context():
+                    # 心跳与过期检查同周期执行，其他进程退出后遗留的执行中任务也会被及时标记
+                    if time.monotonic() - last_heartbeat >= self.heartbeat_interval:
+                        last_heartbeat = time.monotonic()
+                        self._heartbeat()
+                        self._fail_stale_jobs()
+                    self._dispatch_once()
+                    db.session.remove()
+            except Exception as e:
+                self.logger.error(f"Job dispatch error: {e}")
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def _dispatch_once(self):
+        table = Job.__table__
+        for job_type, limit in self.concurrency.items():
+            running = db.session.execute(
+                select(func.count()).select_from(table)
+                .where(table.c.status == RUNNING, table.c.job_type == job_type)
+            ).scalar()
+            if running >= limit:
+                continue
+            job_ids = db.session.execute(
+                select(table.c.id)
+                .where(table.c.status == QUEUED, table.c.job_type == job_type)
+                .order_by(table.c.created_at).limit(limit - running)
+            ).scalars().all()
+            for job_id in job_ids:
+                if self._claim(job_id, job_type, limit):
+                    with self._lock:
+                        self._active.add(job_id)
+                    self._threads.submit(self._run, job_id, job_type)
+
+    def _claim(self, job_id, job_type, limit):
+        """认领任务：条件更新为执行中，并在同一事务内按执行中的同类型任务数校验并发上限"""
+        table = Job.__table__
+        now = datetime.utcnow()
+        try:
+            with db.engine.begin() as conn:
+                # 多个进程同时调度时只有一个能认领成功
+                claimed = conn.execute(table.update().where(table.c.id == job_id, table.c.status == QUEUED)
+                                       .values(status=RUNNING, started_at=now, updated_at=now)).rowcount
+                if not claimed:
+                    return False
+                # 加锁读取：MySQL下并发认领同类型任务的事务互相等待（死锁时回滚其一），SQLite写事务本身串行
+                running = conn.execute(select(table.c.id)
+                                       .where(table.c.status == RUNNING, table.c.job_type == job_type)
+                                       .with_for_update()).all()
+                if len(running) > limit:
+                    raise _ClaimRejected()
+            return True
+        except _ClaimRejected:
+            return False
+        except OperationalError as e:
+            self.logger.warning(f"Job {job_id} claim rolled back: {e}")
+            return False
+
+    def _heartbeat(self):
+        with self._lock:
+            active = list(self._active)
+        if active:
+            table = Job.__table__
+            with db.engine.begin() as conn:
+                conn.execute(table.update().where(table.c.id.in_(active)).values(updated_at=datetime.utcnow()))
+
+    def _fail_stale_jobs(self):
+        """将长时间没有心跳的执行中任务标记为失败（所在进程已退出）"""
+        table = Job.__table__
+        deadline = datetime.utcnow() - timedelta(seconds=self.stale_after)
+        with self._lock:
+            active = list(self._active)
+        stale = table.c.status == RUNNING, table.c.updated_at < deadline, table.c.id.notin_(active)
+        with db.engine.begin() as conn:
+            jobs = conn.execute(select(table.c.id, table.c.params).where(*stale)).all()
+            if not jobs:
+                return
+            conn.execute(table.update().where(table.c.id.in_([job_id for job_id, _ in jobs]), *stale)
+                         .values(status=FAILED, error='Worker stopped while the job was running',
+                                 finished_at=datetime.utcnow()))
+        self.logger.warning(f"Marked {len(jobs)} stale jobs as failed")
+        for _, params in jobs:
+            self._call_finish_hooks(json.loads(params or '{}'))
+
+    def _call_finish_hooks(self, params):
+        for hook in self.finish_hooks:
+            try:
+                hook(params)
+            except Exception as e:
+                self.logger.error(f"Job finish hook error: {e}")
+
+    def _finish(self, job_id, status, ctx=None, result=None, error=None):
+        """写入任务最终状态，失败时（如数据库锁定）重试，重试耗尽的任务由过期检查标记为失败"""
+        table = Job.__table__
+        values = dict(status=status, result=None if result is None else json.dumps(result), error=error)
+        if ctx is not None:
+            # 进度上报有节流，结束时写入最终进度
+            values.update(progress_current=ctx.current, progress_total=ctx.total)
+        for attempt in range(1, self.finish_retries + 1):
+            try:
+                now = datetime.utcnow()
+                with db.engine.begin() as conn:
+                    conn.execute(table.update().where(table.c.id == job_id)
+                                 .values(finished_at=now, updated_at=now, **values))
+                return
+            except Exception as e:
+                self.logger.error(f"Job {job_id} status update to {status} failed "
+                                  f"(attempt {attempt}/{self.finish_retries}): {e}")
+                if attempt < self.finish_retries:
+                    time.sleep(min(2 ** attempt, 30))
+
+    def _run(self, job_id, job_type):
+        with self.app.app_context():
+            ctx = None
+            params = None
+            try:
+                params = json.loads(db.session.get(Job, job_id).params or '{}')
+                ctx = JobContext(self, job_id, params)
+                result = self.handlers[job_type](ctx, params)
+                db.session.commit()
+                self._finish(job_id, SUCCEEDED, ctx, result=result)
+            except JobCancelled:
+                db.session.rollback()
+                self._finish(job_id, CANCELLED, ctx)
+            except Exception as e:
+                db.session.rollback()
+                self.logger.exception(f"Job {job_id} ({job_type}) failed")
+                self._finish(job_id, FAILED, ctx, error=str(e))
+            finally:
+                db.session.remove()
+                if params is not None:
+                    self._call_finish_hooks(params)
+                with self._lock:
+                    self._active.discard(job_id)
+                self._wakeup.set()
+
+
+# 全局任务管理实例
+job_manager = JobManager()
@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from app.database.database import db
+
+
+class ComponentTombstone(db.Model):
+    """元器件删除记录 - 供下游副本通过变更订阅同步删除"""
+    __tablename__ = 'component_tombstones'
+
+    # 自增ID，同时作为删除记录的订阅游标
+    id = db.Column(db.Integer, primary_key=True, comment='删除记录ID')
+    # 被删除的元器件ID
+    component_id = db.Column(db.Integer, nullable=False, comment='被删除的元器件ID')
+    # 被删除的元器件型号
+    part_number = db.Column(db.String(50), nullable=False, comment='被删除的元器件型号/料号')
+    # 被删除的元器件大类
+    component_category = db.Column(db.String(20), comment='被删除的元器件大类')
+    # 删除时间
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, comment='删除时间')
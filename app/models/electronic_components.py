@@ -1,8 +1,12 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+from sqlalchemy.dialects import mysql
 
 from app.database.database import db
 
+# MySQL 下使用微秒精度，变更订阅按时间键集分页时不会因同一秒内的多次更新丢失变更
+PreciseDateTime = db.DateTime().with_variant(mysql.DATETIME(fsp=6), 'mysql')
+
 
 class ElectronicComponent(db.Model):
     """电子元器件基类 - 所有电子元器件的通用属性"""
@@ -30,9 +34,14 @@ class ElectronicComponent(db.Model):
     # 元器件子类
     component_subcategory = db.Column(db.String(20), nullable=False, comment='元器件子类，具体类型取决于大类')
     # 创建时间
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, comment='记录创建时间')
+    created_at = db.Column(PreciseDateTime, default=datetime.utcnow, comment='记录创建时间')
     # 更新时间
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, comment='记录最后更新时间')
+    updated_at = db.Column(PreciseDateTime, default=datetime.utcnow, onupdate=datetime.utcnow, comment='记录最后更新时间')
+
+    __table_args__ = (
+        # 变更订阅按 (updated_at, id) 键集分页
+        db.Index('idx_updated_at_id', 'updated_at', 'id'),
+    )
 
     __mapper_args__ = {
         'polymorphic_identity': 'electronic_component',
@@ -0,0 +1,44 @@
+from datetime import datetime
+from sqlalchemy.dialects import mysql
+
+from app.database.database import db
+
+# 任务参数和结果可能较大，MySQL下使用LONGTEXT
+LongText = db.Text().with_variant(mysql.LONGTEXT(), 'mysql')
+
+
+class Job(db.Model):
+    """后台任务 - 导入、导出、BOM匹配、缓存重建等长时间操作"""
+    __tablename__ = 'jobs'
+
+    # 任务ID（UUID）
+    id = db.Column(db.String(36), primary_key=True, comment='任务唯一标识ID')
+    # 任务类型
+    job_type = db.Column(db.String(50), nullable=False, comment='任务类型：import、export_snapshot、bom_match、cache_rebuild')
+    # 任务状态
+    status = db.Column(db.String(20), nullable=False, default='queued',
+                       comment='任务状态：queued(排队)、running(执行中)、succeeded(成功)、failed(失败)、cancelled(已取消)')
+    # 任务参数
+    params = db.Column(LongText, comment='任务参数，JSON格式')
+    # 任务结果
+    result = db.Column(LongText, comment='任务结果，JSON格式')
+    # 错误信息
+    error = db.Column(db.Text, comment='失败时的错误信息')
+    # 已完成数量
+    progress_current = db.Column(db.Integer, default=0, comment='已处理数量')
+    # 总数量
+    progress_total = db.Column(db.Integer, comment='待处理总数量，未知时为空')
+    # 取消请求
+    cancel_requested = db.Column(db.Boolean, default=False, comment='是否已请求取消')
+    # 创建时间
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, comment='任务创建时间')
+    # 开始时间
+    started_at = db.Column(db.DateTime, comment='任务开始执行时间')
+    # 结束时间
+    finished_at = db.Column(db.DateTime, comment='任务结束时间')
+    # 更新时间（执行中的任务定期刷新，作为心跳）
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, comment='记录最后更新时间')
+
+    __table_args__ = (
+        db.Index('idx_status_type_created', 'status', 'job_type', 'created_at'),
+    )
@@ -1,9 +1,11 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+from sqlalchemy import bindparam, event
 
 from app.models.electronic_components import ElectronicComponent
 
 from app.database.database import db
+from app.models.units import memory_capacity_to_bits
 
 
 class MemoryChip(ElectronicComponent):
@@ -19,6 +21,8 @@ class MemoryChip(ElectronicComponent):
     capacity = db.Column(db.Integer, comment='存储容量，单位：KB/MB/GB')
     # 容量单位
     capacity_unit = db.Column(db.String(10), comment='容量单位：KB、MB、GB')
+    # 归一化存储容量（写入时自动维护，用于索引范围查询）
+    capacity_bits = db.Column(db.BigInteger, index=True, comment='归一化存储容量，单位：bit')
     # 接口类型
     interface_type = db.Column(db.String(50), comment='接口类型：SPI、I2C、Parallel、SDIO等')
     # 读写速度
@@ -28,4 +32,36 @@ class MemoryChip(ElectronicComponent):
 
     __mapper_args__ = {
         'polymorphic_identity': 'memory'
-    }
\ No newline at end of file
+    }
+
+
+@event.listens_for(MemoryChip, 'before_insert')
+@event.listens_for(MemoryChip, 'before_update')
+def normalize_capacity(mapper, connection, target):
+    """写入前维护归一化存储容量"""
+    target.capacity_bits = memory_capacity_to_bits(target.capacity, target.capacity_unit)
+
+
+def backfill_capacity_bits(batch_size=500):
+    """回填存量数据的归一化存储容量，返回回填数量"""
+    # 直接更新 memory_chips 表，不触发基础表 updated_at 变化，避免变更订阅全量推送
+    statement = MemoryChip.__table__.update() \
+        .where(MemoryChip.__table__.c.id == bindparam('chip_id')) \
+        .values(capacity_bits=bindparam('bits'))
+    last_id = 0
+    total = 0
+    while True:
+        rows = db.session.query(MemoryChip.id, MemoryChip.capacity, MemoryChip.capacity_unit) \
+            .filter(MemoryChip.id > last_id, MemoryChip.capacity_bits.is_(None)) \
+            .order_by(MemoryChip.id).limit(batch_size).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        params = [{'chip_id': row.id, 'bits': memory_capacity_to_bits(row.capacity, row.capacity_unit)}
+                  for row in rows]
+        params = [param for param in params if param['bits'] is not None]
+        if params:
+            db.session.execute(statement, params)
+            total += len(params)
+    db.session.commit()
+    return total
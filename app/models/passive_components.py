@@ -1,8 +1,10 @@
 from app.models.electronic_components import ElectronicComponent
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+from sqlalchemy import bindparam, event
 
 from app.database.database import db
+from app.models.units import normalize_passive_value
 
 
 class PassiveComponent(ElectronicComponent):
@@ -23,7 +25,50 @@ class PassiveComponent(ElectronicComponent):
     rated_voltage = db.Column(db.Float, comment='额定电压，单位：V')
     # 温度系数
     temperature_coefficient = db.Column(db.String(50), comment='温度系数')
+    # 归一化额定值（写入时自动维护，用于索引范围查询）
+    nominal_value_base = db.Column(db.Float(precision=53), comment='换算到基本单位的额定值')
+    # 归一化单位
+    value_base_unit = db.Column(db.String(4), comment='基本单位：Ω、F、H')
+
+    __table_args__ = (
+        db.Index('idx_value_base', 'value_base_unit', 'nominal_value_base'),
+    )
 
     __mapper_args__ = {
         'polymorphic_identity': 'passive'
-    }
\ No newline at end of file
+    }
+
+
+@event.listens_for(PassiveComponent, 'before_insert')
+@event.listens_for(PassiveComponent, 'before_update')
+def normalize_nominal_value(mapper, connection, target):
+    """写入前维护归一化额定值"""
+    target.nominal_value_base, target.value_base_unit = normalize_passive_value(
+        target.nominal_value, target.value_unit)
+
+
+def backfill_nominal_value_base(batch_size=500):
+    """回填存量数据的归一化额定值，返回回填数量"""
+    # 直接更新 passive_components 表，不触发基础表 updated_at 变化，避免变更订阅全量推送
+    statement = PassiveComponent.__table__.update() \
+        .where(PassiveComponent.__table__.c.id == bindparam('component_id')) \
+        .values(nominal_value_base=bindparam('base_value'), value_base_unit=bindparam('base_unit'))
+    last_id = 0
+    total = 0
+    while True:
+        rows = db.session.query(PassiveComponent.id, PassiveComponent.nominal_value, PassiveComponent.value_unit) \
+            .filter(PassiveComponent.id > last_id, PassiveComponent.value_base_unit.is_(None)) \
+            .order_by(PassiveComponent.id).limit(batch_size).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        params = []
+        for row in rows:
+            base_value, base_unit = normalize_passive_value(row.nominal_value, row.value_unit)
+            if base_unit is not None:
+                params.append({'component_id': row.id, 'base_value': base_value, 'base_unit': base_unit})
+        if params:
+            db.session.execute(statement, params)
+            total += len(params)
+    db.session.commit()
+    return total
@@ -0,0 +1,112 @@
+import re
+from typing import Optional, Tuple
+
+# SI 词头
+SI_PREFIXES = {
+    'p': 1e-12,
+    'n': 1e-9,
+    'u': 1e-6,
+    'µ': 1e-6,  # MICRO SIGN
+    'μ': 1e-6,  # GREEK SMALL LETTER MU
+    'm': 1e-3,
+    '': 1.0,
+    'k': 1e3,
+    'K': 1e3,
+    'M': 1e6,
+    'G': 1e9,
+    'T': 1e12,
+}
+
+# 被动元件数值单位 -> 基本单位
+PASSIVE_BASE_UNITS = {
+    'Ω': 'Ω',
+    'Ω': 'Ω',  # OHM SIGN
+    'ohm': 'Ω',
+    'Ohm': 'Ω',
+    'R': 'Ω',
+    'F': 'F',
+    'H': 'H',
+}
+
+# 存储容量词头，按存储器惯例使用二进制倍数
+MEMORY_PREFIXES = {
+    '': 1,
+    'K': 1 << 10,
+    'k': 1 << 10,
+    'M': 1 << 20,
+    'G': 1 << 30,
+    'T': 1 << 40,
+}
+
+# 存储容量单位 -> 每单位的bit数
+MEMORY_BASE_UNITS = {
+    'B': 8,
+    'Byte': 8,
+    'b': 1,
+    'bit': 1,
+    'Bit': 1,
+}
+
+_QUANTITY_PATTERN = re.compile(r'^\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*(.*?)\s*$')
+
+
+def _split_unit(unit: str, base_units: dict, prefixes: dict) -> Optional[Tuple[object, object]]:
+    """将单位拆分为 (词头倍数, 基本单位)，优先匹配最长的基本单位"""
+    for base in sorted(base_units, key=len, reverse=True):
+        if unit.endswith(base):
+            prefix = unit[:-len(base)]
+            if prefix in prefixes:
+                return prefixes[prefix], base_units[base]
+    return None
+
+
+def normalize_passive_value(value, unit) -> Tuple[Optional[float], Optional[str]]:
+    """被动元件额定值换算为基本单位，如 (10, 'µF') -> (1e-05, 'F')；无法换算时返回 (None, None)"""
+    if value is None or not unit:
+        return None, None
+    parts = _split_unit(unit.strip(), PASSIVE_BASE_UNITS, SI_PREFIXES)
+    if parts is None:
+        return None, None
+    multiplier, base_unit = parts
+    # 保留7位有效数字（额定值列为单精度FLOAT），消除浮点误差，使 4.7kΩ 与 4700Ω 的归一化值完全相等
+    return float(f"{value * multiplier:.7g}"), base_unit
+
+
+def memory_capacity_to_bits(capacity, unit) -> Optional[int]:
+    """存储容量换算为bit，如 (1, 'MB') -> 8388608；无法换算时返回None"""
+    if capacity is None or not unit:
+        return None
+    unit = unit.strip()
+    if unit.endswith('bits'):
+        unit = unit[:-1]
+    parts = _split_unit(unit, MEMORY_BASE_UNITS, MEMORY_PREFIXES)
+    if parts is None:
+        return None
+    multiplier, bits_per_unit = parts
+    return int(round(capacity * multiplier * bits_per_unit))
+
+
+def parse_quantity(text: str) -> Tuple[float, str]:
+    """解析带单位的数量字符串，如 '10µF' -> (10.0, 'µF')"""
+    match = _QUANTITY_PATTERN.match(text or '')
+    if not match:
+        raise ValueError(f"Invalid quantity: {text}")
+    return float(match.group(1)), match.group(2)
+
+
+def parse_passive_quantity(text: str) -> Tuple[float, str]:
+    """解析被动元件数值查询条件，返回 (基本单位数值, 基本单位)"""
+    value, unit = parse_quantity(text)
+    base_value, base_unit = normalize_passive_value(value, unit)
+    if base_unit is None:
+        raise ValueError(f"Unknown unit in quantity: {text}")
+    return base_value, base_unit
+
+
+def parse_memory_quantity(text: str) -> int:
+    """解析存储容量查询条件，返回bit数"""
+    capacity, unit = parse_quantity(text)
+    bits = memory_capacity_to_bits(capacity, unit)
+    if bits is None:
+        raise ValueError(f"Unknown unit in quantity: {text}")
+    return bits
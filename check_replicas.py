@@ -0,0 +1,79 @@
+# check_replicas.py
+"""
+只读副本路由本地检查：使用两个 SQLite 数据库（主库、副本）验证
+轮询选择副本、故障副本 mark_down 切换、写后 read_primary_until Cookie 读主库、
+X-Read-Consistency: strong 读主库。
+
+    python check_replicas.py
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+failures = []
+
+
+def check(name, condition, detail=''):
+    print(f"[{'通过' if condition else '失败'}] {name}" + (f"：{detail}" if detail else ''))
+    if not condition:
+        failures.append(name)
+
+
+def main():
+    workdir = tempfile.mkdtemp(prefix='chip_replicas_')
+    primary = os.path.join(workdir, 'primary.db')
+    replica = os.path.join(workdir, 'replica.db')
+    # 第二个副本指向不存在的目录，连接时报 OperationalError，模拟故障副本
+    dead_replica = os.path.join(workdir, 'missing', 'replica.db')
+    os.environ['DATABASE_URL'] = f"sqlite:///{primary}"
+    os.environ.pop('CATALOG_SNAPSHOT_PATH', None)
+
+    from app.run import create_app
+    from app.database.replica_router import replica_router
+
+    try:
+        # 主库建表并写入一条数据，复制为副本
+        os.environ['DATABASE_REPLICA_URLS'] = ''
+        seed = create_app().test_client()
+        seed.post('/api/components/mcu', json={'name': 'MCU', 'manufacturer': 'ST', 'part_number': 'REPLICATED'})
+        shutil.copy(primary, replica)
+
+        os.environ['DATABASE_REPLICA_URLS'] = f"sqlite:///{replica},sqlite:///{dead_replica}"
+        app = create_app()
+
+        # 副本复制之后主库又写入一条，主库2条、副本1条，按总数区分读的是哪个库
+        app.test_client().post('/api/components/mcu',
+                               json={'name': 'MCU', 'manufacturer': 'ST', 'part_number': 'PRIMARY_ONLY'})
+
+        def total(client, **kwargs):
+            return client.get('/api/components/components', **kwargs).json['total']
+
+        chosen = [replica_router.choose() for _ in range(4)]
+        check('轮询选择副本', chosen[0] != chosen[1] and chosen[:2] == chosen[2:], ', '.join(chosen))
+
+        # 轮到故障副本的请求标记其故障并切换到下一个副本
+        totals = [total(app.test_client()) for _ in range(2)]
+        check('故障副本切换', totals == [1, 1], f"副本读取结果 {totals}")
+        check('故障副本 mark_down', replica_router.choose(exclude=('replica_0',)) is None,
+              '冷却期内不再路由到 replica_1')
+
+        check('X-Read-Consistency: strong 读主库',
+              total(app.test_client(), headers={'X-Read-Consistency': 'strong'}) == 2)
+
+        client = app.test_client()
+        response = client.post('/api/components/mcu',
+                               json={'name': 'MCU', 'manufacturer': 'ST', 'part_number': 'WRITTEN'})
+        cookie = client.get_cookie(replica_router.PRIMARY_COOKIE)
+        check('写请求设置 read_primary_until Cookie', response.status_code < 400 and cookie is not None)
+        check('Cookie 有效期内读主库', total(client) == 3)
+        check('没有 Cookie 的请求读副本', total(app.test_client()) == 1)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print('全部通过' if not failures else f"{len(failures)} 项失败")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())